@@ -387,7 +387,14 @@ def fetch(uri: str, method: str = 'GET', headers: dict | None = None,
     :type verify: bool or path to certificates
     :keyword callbacks: Methods to call once data is fetched
     :type callbacks: list of callable
+    :keyword stream: if True, the response content is not downloaded
+        immediately and the encoding is not detected from the content
+    :type stream: bool
     :rtype: :py:obj:`requests.Response`
+
+    .. versionchanged:: 9.0
+       the encoding of streamed responses is taken from *charset* or
+       the content-type header only; JSON content defaults to utf-8.
     """
     # Change user agent depending on fake UA settings.
     # Set header to new UA if needed.
@@ -451,7 +458,15 @@ def fetch(uri: str, method: str = 'GET', headers: dict | None = None,
     except Exception as e:
         response = e
     else:
-        response.encoding = _decide_encoding(response, charset)
+        if kwargs.get('stream'):
+            # detecting the encoding would read the whole content
+            content_type = response.headers.get('content-type', '')
+            response.encoding = (
+                charset
+                or get_charset_from_content_type(content_type)
+                or ('utf-8' if 'json' in content_type else None))
+        else:
+            response.encoding = _decide_encoding(response, charset)
 
     for callback in callbacks:
         callback(response)
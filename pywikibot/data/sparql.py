@@ -6,25 +6,119 @@
 #
 from __future__ import annotations
 
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import suppress
+from copy import copy
+from itertools import chain
 from textwrap import fill
-from urllib.parse import quote
+from types import MappingProxyType
+from typing import Any
+from urllib.parse import urlparse
+from weakref import WeakKeyDictionary
 
+from requests.adapters import HTTPAdapter
 from requests.exceptions import Timeout
 
-from pywikibot import Site
-from pywikibot.backports import removeprefix
+from pywikibot import Site, config
+from pywikibot.backports import Iterable, Mapping
 from pywikibot.comms import http
 from pywikibot.data import WaitingMixin
 from pywikibot.exceptions import Error, NoUsernameError
 
 
 try:
-    from requests import JSONDecodeError
-except ImportError:  # requests < 2.27.0
-    from json import JSONDecodeError
+    from orjson import loads as json_loads
+except ImportError:
+    try:
+        from ujson import loads as json_loads
+    except ImportError:
+        from json import loads as json_loads
 
-DEFAULT_HEADERS = {'cache-control': 'no-cache',
-                   'Accept': 'application/sparql-results+json'}
+try:
+    import ijson
+except ImportError as e:
+    ijson = e
+
+DEFAULT_HEADERS = MappingProxyType({
+    'cache-control': 'no-cache',
+    'Accept': 'application/sparql-results+json',
+    'Connection': 'keep-alive',
+})
+
+# boolean result of a small ASK query response
+ASK_RESULT = re.compile(rb'"boolean"\s*:\s*(true|false)')
+
+# queries with non-deterministic functions are never cached
+NOT_CACHEABLE = re.compile(r'\b(?:NOW|RAND|UUID|STRUUID|BNODE)\s*\(',
+                           re.IGNORECASE)
+
+
+def _mount_adapter(endpoint: str) -> None:
+    """Mount a dedicated connection pool for the endpoint host.
+
+    The adapter is mounted on the shared ``http.session`` once
+    per host; subsequent queries reuse its keep-alive connections and
+    skip the TCP and TLS handshake.
+
+    .. versionadded:: 9.0
+
+    :param endpoint: SPARQL endpoint URL
+    """
+    url = urlparse(endpoint)
+    prefix = f'{url.scheme}://{url.netloc}/'
+    if prefix not in http.session.adapters:
+        http.session.mount(prefix, HTTPAdapter(pool_connections=4,
+                                               pool_maxsize=16,
+                                               max_retries=0))
+
+
+class _PrefixReader:
+    """File-like object which reads *prefix* before the *raw* stream."""
+
+    def __init__(self, prefix: bytes, raw) -> None:
+        """Create reader."""
+        self.prefix = prefix
+        self.raw = raw
+
+    def read(self, size: int = -1) -> bytes:
+        """Return the prefix first and then read from the raw stream."""
+        if self.prefix and size:
+            data, self.prefix = self.prefix, b''
+            return data
+        return self.raw.read(size)
+
+
+_repo_endpoints: WeakKeyDictionary = WeakKeyDictionary()
+
+
+def _repo_endpoint(repo) -> tuple[str, str]:
+    """Return SPARQL endpoint and entity URL of a repository.
+
+    The result is cached for every repository.
+
+    :param repo: The Wikibase site
+    :type repo: pywikibot.site.DataSite
+    """
+    with suppress(KeyError):
+        return _repo_endpoints[repo]
+
+    try:
+        endpoint = repo.sparql_endpoint
+        entity_url = repo.concept_base_uri
+    except NotImplementedError:
+        raise NotImplementedError(
+            'Wiki version must be 1.28-wmf.23 or newer to '
+            'automatically extract the sparql endpoint. '
+            'Please provide the endpoint and entity_url '
+            'parameters instead of a repo.')
+    if not endpoint:
+        raise Error(f'The site {repo} does not provide a sparql endpoint.')
+
+    _repo_endpoints[repo] = endpoint, entity_url
+    return endpoint, entity_url
 
 
 class SparqlQuery(WaitingMixin):
@@ -35,16 +129,35 @@ class SparqlQuery(WaitingMixin):
     .. versionchanged:: 8.4
        inherited from :class:`data.WaitingMixin` which provides a
        :meth:`data.WaitingMixin.wait` method.
+    .. versionchanged:: 9.0
+       connections to the endpoint host are pooled and kept alive.
+       Query results can be cached; see *cache_ttl* parameter and
+       :meth:`clear_cache`.
     """
 
+    #: maximum number of cached query results shared by all instances
+    cache_size = 128
+
+    #: minimum response size in bytes to be parsed incrementally;
+    #: compressed responses are always parsed incrementally
+    stream_min_size = 1 << 20
+
+    _cache: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+    _cache_lock = threading.Lock()
+
     def __init__(self,
                  endpoint: str | None = None,
                  entity_url: str | None = None, repo=None,
                  max_retries: int | None = None,
-                 retry_wait: float | None = None) -> None:
+                 retry_wait: float | None = None,
+                 cache_ttl: float | None = 0) -> None:
         """
         Create endpoint.
 
+        .. versionchanged:: 9.0
+           *cache_ttl* parameter was added. The default Wikidata site
+           and the endpoint of a *repo* are cached.
+
         :param endpoint: SPARQL endpoint URL
         :param entity_url: URL prefix for any entities returned in a query.
         :param repo: The Wikibase site which we want to run queries on. If
@@ -56,24 +169,16 @@ class SparqlQuery(WaitingMixin):
         :param retry_wait: (optional) Minimum time in seconds to wait after an
                error, defaults to config.retry_wait seconds (doubles each retry
                until config.retry_max is reached).
+        :param cache_ttl: (optional) Time in seconds a cached query
+               result is valid. Results are not cached if 0 (default);
+               cached results never expire if None.
         """
         # default to Wikidata
         if not repo and not endpoint:
             repo = Site('wikidata')
 
         if repo:
-            try:
-                self.endpoint = repo.sparql_endpoint
-                self.entity_url = repo.concept_base_uri
-            except NotImplementedError:
-                raise NotImplementedError(
-                    'Wiki version must be 1.28-wmf.23 or newer to '
-                    'automatically extract the sparql endpoint. '
-                    'Please provide the endpoint and entity_url '
-                    'parameters instead of a repo.')
-            if not self.endpoint:
-                raise Error(
-                    f'The site {repo} does not provide a sparql endpoint.')
+            self.endpoint, self.entity_url = _repo_endpoint(repo)
         else:
             if not entity_url:
                 raise Error('If initialised with an endpoint the entity_url '
@@ -81,12 +186,14 @@ class SparqlQuery(WaitingMixin):
             self.endpoint = endpoint
             self.entity_url = entity_url
 
+        _mount_adapter(self.endpoint)
         self.last_response = None
+        self.cache_ttl = cache_ttl
 
-        if max_retries is not None:
-            self.max_retries = max_retries
-        if retry_wait is not None:
-            self.retry_wait = retry_wait
+        self.max_retries = (config.max_retries if max_retries is None
+                            else max_retries)
+        self.retry_wait = (config.retry_wait if retry_wait is None
+                           else retry_wait)
 
     def get_last_response(self):
         """
@@ -96,10 +203,58 @@ class SparqlQuery(WaitingMixin):
         """
         return self.last_response
 
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Remove all cached query results.
+
+        .. versionadded:: 9.0
+        """
+        with cls._cache_lock:
+            cls._cache.clear()
+
+    def _cache_key(self, query: str, headers: Mapping[str, str],
+                   *args) -> tuple | None:
+        """Return the cache key for a query or None if not cacheable."""
+        if self.cache_ttl == 0 or NOT_CACHEABLE.search(query):
+            return None
+        return (self.endpoint, self.entity_url, query,
+                frozenset(headers.items())) + args
+
+    def _get_cached(self, key: tuple | None) -> Any:
+        """Return a cached result or None if missing or expired."""
+        if key is None:
+            return None
+
+        with self._cache_lock:
+            try:
+                timestamp, value = self._cache[key]
+            except KeyError:
+                return None
+
+            if (self.cache_ttl is not None
+                    and time.monotonic() - timestamp > self.cache_ttl):
+                del self._cache[key]
+                return None
+
+            self._cache.move_to_end(key)
+            return value
+
+    def _set_cached(self, key: tuple | None, value: Any) -> None:
+        """Store a result in the cache and drop the least recent one."""
+        if key is None or value is None:
+            return
+
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic(), value)
+            self._cache.move_to_end(key)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
     def select(self,
                query: str,
                full_data: bool = False,
-               headers: dict[str, str] | None = None
+               headers: Mapping[str, str] | None = None,
+               stream: bool = False
                ) -> list[dict[str, str]] | None:
         """
         Run SPARQL query and return the result.
@@ -107,41 +262,135 @@ class SparqlQuery(WaitingMixin):
         The response is assumed to be in format defined by:
         https://www.w3.org/TR/2013/REC-sparql11-results-json-20130321/
 
+        .. versionchanged:: 9.0
+           the result may be cached, see *cache_ttl* parameter of
+           :class:`SparqlQuery`; *stream* parameter was added.
+
         :param query: Query text
         :param full_data: Whether return full data objects or only values
+        :param stream: Parse large responses incrementally with ``ijson``
+            to reduce peak memory. Ignored if ``ijson`` is not installed.
+            Streamed results are not cached.
         """
         if headers is None:
             headers = DEFAULT_HEADERS
 
-        data = self.query(query, headers=headers)
-        if not data or 'results' not in data:
+        if stream and not isinstance(ijson, ImportError):
+            return self._select_stream(query, headers, full_data)
+
+        key = self._cache_key(query, headers, 'select', full_data)
+        result = self._get_cached(key)
+        if result is None:
+            self._fetch(query, headers)
+            data = self._decode()
+            if not data or 'results' not in data:
+                return None
+
+            result = self._make_rows(data['head']['vars'],
+                                     data['results']['bindings'], full_data)
+            self._set_cached(key, result)
+
+        if key is None:
+            return result
+
+        # return copies; the cached rows and nodes must not be modified
+        if full_data:
+            return [{var: copy(node) for var, node in row.items()}
+                    for row in result]
+        return [row.copy() for row in result]
+
+    def _select_stream(self, query: str, headers: Mapping[str, str],
+                       full_data: bool) -> list[dict[str, Any]] | None:
+        """Run SPARQL SELECT query and parse the response incrementally.
+
+        Uncompressed responses smaller than :attr:`stream_min_size` are
+        decoded at once because streaming overhead dominates for small
+        payloads.
+        The head of the response is expected before the results as sent
+        by the Wikidata Query Service; otherwise the rows are built from
+        the variables bound in each result row. None is returned if the
+        response is not valid JSON.
+
+        :raises NoUsernameError: User not logged in
+        """
+        self._fetch(query, headers, stream=True)
+        response = self.last_response
+        size = response.headers.get('content-length')
+        # the length of compressed content does not tell the real size
+        if (size is not None and 'content-encoding' not in response.headers
+                and int(size) < self.stream_min_size):
+            data = self._decode()
+            if not data or 'results' not in data:
+                return None
+            return self._make_rows(data['head']['vars'],
+                                   data['results']['bindings'], full_data)
+
+        try:
+            response.raw.decode_content = True
+            # keep the start of the response for the login page check
+            head = response.raw.read(1 << 16)
+            events = ijson.parse(_PrefixReader(head, response.raw),
+                                 use_float=True)
+            qvars = None
+            for prefix, event, value in events:
+                if prefix == 'head.vars' and event == 'start_array':
+                    qvars = []
+                elif prefix == 'head.vars.item':
+                    qvars.append(value)
+                elif prefix == 'results':
+                    break
+            else:
+                return None
+
+            bindings = ijson.items(chain([(prefix, event, value)], events),
+                                   'results.bindings.item')
+            return self._make_rows(qvars, bindings, full_data)
+        except ijson.JSONError:
+            self._check_login(head)
             return None
+        finally:
+            response.close()
 
-        result = []
-        qvars = data['head']['vars']
-        for row in data['results']['bindings']:
-            values = {}
-            for var in qvars:
-                if var not in row:
-                    # var is not available (OPTIONAL is probably used)
-                    values[var] = None
-                elif full_data:
-                    if row[var]['type'] not in VALUE_TYPES:
-                        raise ValueError(f"Unknown type: {row[var]['type']}")
-                    valtype = VALUE_TYPES[row[var]['type']]
-                    values[var] = valtype(row[var],
-                                          entity_url=self.entity_url)
-                else:
-                    values[var] = row[var]['value']
-            result.append(values)
-        return result
+    def _make_rows(self, qvars: list[str] | None, bindings: Iterable[dict],
+                   full_data: bool) -> list[dict[str, Any]]:
+        """Convert result bindings into rows of values.
+
+        Variables which are not available in a row (OPTIONAL is
+        probably used) are set to None. If *qvars* is None, the
+        variables bound in each row are used.
+        """
+        if full_data:
+            make_node = self._make_node
+            return [{var: make_node(row[var]) if var in row else None
+                     for var in (row if qvars is None else qvars)}
+                    for row in bindings]
+
+        return [{var: row[var]['value'] if var in row else None
+                 for var in (row if qvars is None else qvars)}
+                for row in bindings]
+
+    def _make_node(self, cell: dict[str, Any]) -> SparqlNode:
+        """Return the node object of a result cell.
 
-    def query(self, query: str, headers: dict[str, str] | None = None):
+        :raises ValueError: unknown type of the cell
+        """
+        value_type = cell['type']
+        if value_type not in VALUE_TYPES:
+            raise ValueError(f'Unknown type: {value_type}')
+        return VALUE_TYPES[value_type](cell, entity_url=self.entity_url)
+
+    def query(self, query: str, headers: Mapping[str, str] | None = None):
         """Run SPARQL query and return parsed JSON result.
 
         .. versionchanged:: 8.5
            :exc:``exceptions.NoUsernameError` is raised if the response
            looks like the user is not logged in.
+        .. versionchanged:: 9.0
+           the result may be cached, see *cache_ttl* parameter of
+           :class:`SparqlQuery`; :attr:`last_response` is left
+           untouched if a cached result is returned. The query is sent as
+           form-encoded POST request. The response is decoded with
+           ``orjson`` or ``ujson`` if installed.
 
         :param query: Query text
         :raises NoUsernameError: User not logged in
@@ -149,73 +398,149 @@ class SparqlQuery(WaitingMixin):
         if headers is None:
             headers = DEFAULT_HEADERS
 
+        key = self._cache_key(query, headers)
+        content = self._get_cached(key)
+        if content is not None:
+            # decode the cached bytes to return a new object every time
+            return json_loads(content)
+
+        self._fetch(query, headers)
+        data = self._decode()
+        if data is not None:
+            self._set_cached(key, self.last_response.content)
+        return data
+
+    def _fetch(self, query: str, headers: Mapping[str, str],
+               **kwargs) -> None:
+        """Send the query to the endpoint and store the response.
+
+        :param query: Query text
+        :keyword stream: do not read the response content immediately
+        """
         # force cleared
         self.last_response = None
 
-        url = f'{self.endpoint}?query={quote(query)}'
+        headers = {**headers,
+                   'Content-Type': 'application/x-www-form-urlencoded'}
         while True:
             try:
-                self.last_response = http.fetch(url, headers=headers)
+                self.last_response = http.fetch(self.endpoint,
+                                                method='POST',
+                                                data={'query': query},
+                                                headers=headers,
+                                                **kwargs)
                 break
             except Timeout:
                 self.wait()
 
+    def _decode(self) -> dict[str, Any] | None:
+        """Return parsed JSON of the last response.
+
+        :raises NoUsernameError: User not logged in
+        """
         try:
-            return self.last_response.json()
-        except JSONDecodeError:
-            # There is no proper error given but server returns HTML page
-            # in case login isn't valid sotry to guess what the problem is
-            # and notify user instead of silently ignoring it.
-            # This could be made more reliable by fixing the backend.
-            # Note: only raise error when response starts with HTML,
-            # not in case the response otherwise might have it in between
-            strcontent = self.last_response.content.decode()
-            if (strcontent.startswith('<!DOCTYPE html>')
-                and 'https://commons-query.wikimedia.org' in url
-                and ('Special:UserLogin' in strcontent
-                     or 'Special:OAuth' in strcontent)):
+            return json_loads(self.last_response.content)
+        except ValueError:  # JSONDecodeError of all json libraries
+            self._check_login(self.last_response.content)
+        return None
+
+    def _check_login(self, content: bytes) -> None:
+        """Check whether a response which is not JSON is a login page.
+
+        :param content: the response content or at least its start
+        :raises NoUsernameError: User not logged in
+        """
+        # There is no proper error given but server returns HTML page
+        # in case login isn't valid sotry to guess what the problem is
+        # and notify user instead of silently ignoring it.
+        # This could be made more reliable by fixing the backend.
+        # Note: only raise error when response starts with HTML,
+        # not in case the response otherwise might have it in between
+        if ('https://commons-query.wikimedia.org' in self.endpoint
+                and content.startswith(b'<!DOCTYPE html>')):
+            # only decode the start of a possibly large page
+            head = content[:65536].decode('utf-8', 'replace')
+            if 'Special:UserLogin' in head or 'Special:OAuth' in head:
                 raise NoUsernameError(fill(
-                    'User not logged in. You need to log in to Wikimedia '
-                    'Commons and give OAUTH permission. Open '
-                    'https://commons-query.wikimedia.org with browser to '
-                    'login and give permission.'
+                    'User not logged in. You need to log in to '
+                    'Wikimedia Commons and give OAUTH permission. '
+                    'Open https://commons-query.wikimedia.org with '
+                    'browser to login and give permission.'
                 ))
-        return None
 
     def ask(self, query: str,
-            headers: dict[str, str] | None = None) -> bool:
+            headers: Mapping[str, str] | None = DEFAULT_HEADERS) -> bool:
         """
         Run SPARQL ASK query and return boolean result.
 
+        .. versionchanged:: 9.0
+           the result may be cached, see *cache_ttl* parameter of
+           :class:`SparqlQuery`; small responses are not decoded as
+           JSON.
+
         :param query: Query text
         """
         if headers is None:
             headers = DEFAULT_HEADERS
-        data = self.query(query, headers=headers)
-        return data['boolean']
 
-    def get_items(self, query, item_name: str = 'item', result_type=set):
+        key = self._cache_key(query, headers, 'ask')
+        result = self._get_cached(key)
+        if result is not None:
+            return result
+
+        self._fetch(query, headers)
+        content = self.last_response.content
+        if len(content) < 256 and (match := ASK_RESULT.search(content)):
+            result = match[1] == b'true'
+        else:
+            result = self._decode()['boolean']
+
+        self._set_cached(key, result)
+        return result
+
+    def get_items(self, query, item_name: str = 'item', result_type=set,
+                  full_data: bool = False):
         """
         Retrieve items which satisfy given query.
 
         Items are returned as Wikibase IDs.
 
+        .. versionchanged:: 9.0
+           the IDs are extracted from the plain values unless
+           *full_data* is given.
+
         :param query: Query string. Must contain ?{item_name} as one of the
             projected values.
         :param item_name: Name of the value to extract
         :param result_type: type of the iterable in which
               SPARQL results are stored (default set)
         :type result_type: iterable
+        :param full_data: Extract the IDs from :class:`URI` objects
+            instead of the plain values
         :return: item ids, e.g. Q1234
         :rtype: same as result_type
         """
-        if res := self.select(query, full_data=True):
-            return result_type(r[item_name].getID() for r in res)
+        if full_data:
+            if res := self.select(query, full_data=True):
+                return result_type(r[item_name].getID() for r in res)
+            return result_type()
+
+        if res := self.select(query):
+            prefix = self.entity_url
+            n = len(prefix)
+            return result_type(url[n:] if url.startswith(prefix) else None
+                               for url in (r[item_name] for r in res))
         return result_type()
 
 
 class SparqlNode:
-    """Base class for SPARQL nodes."""
+    """Base class for SPARQL nodes.
+
+    .. versionchanged:: 9.0
+       nodes use ``__slots__``; attributes cannot be added dynamically.
+    """
+
+    __slots__ = ('value', )
 
     def __init__(self, value) -> None:
         """Create a SparqlNode."""
@@ -228,6 +553,8 @@ class SparqlNode:
 class URI(SparqlNode):
     """Representation of URI result type."""
 
+    __slots__ = ('entity_url', )
+
     def __init__(self, data: dict, entity_url, **kwargs) -> None:
         """Create URI object."""
         super().__init__(data.get('value'))
@@ -239,9 +566,8 @@ class URI(SparqlNode):
 
         :return: ID of Wikibase object, e.g. Q1234
         """
-        if self.value.startswith(self.entity_url):
-            return removeprefix(self.value, self.entity_url)
-        return None
+        n = len(self.entity_url)
+        return self.value[n:] if self.value[:n] == self.entity_url else None
 
     def __repr__(self) -> str:
         return f'<{self.value}>'
@@ -250,6 +576,8 @@ class URI(SparqlNode):
 class Literal(SparqlNode):
     """Representation of RDF literal result type."""
 
+    __slots__ = ('type', 'language')
+
     def __init__(self, data: dict, **kwargs) -> None:
         """Create Literal object."""
         super().__init__(data.get('value'))
@@ -265,6 +593,8 @@ class Literal(SparqlNode):
 class Bnode(SparqlNode):
     """Representation of blank node."""
 
+    __slots__ = ()
+
     def __init__(self, data: dict, **kwargs) -> None:
         """Create Bnode."""
         super().__init__(data.get('value'))
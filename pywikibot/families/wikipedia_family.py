@@ -16,16 +16,16 @@ class Family(family.SubdomainFamily, family.WikimediaFamily):
 
     name = 'wikipedia'
 
-    closed_wikis = [
+    closed_wikis = family.LazyFrozenSet([
         # https://noc.wikimedia.org/conf/highlight.php?file=dblists/closed.dblist
         'aa', 'ak', 'cho', 'ho', 'hz', 'ii', 'kj', 'kr', 'lrc', 'mh', 'mus',
         'na', 'ng', 'ten',
-    ]
+    ])
 
-    removed_wikis = [
+    removed_wikis = family.LazyFrozenSet([
         # https://noc.wikimedia.org/conf/highlight.php?file=dblists/deleted.dblist
         'dk', 'mo', 'ru-sib', 'tlh', 'tokipona', 'zh_cn', 'zh_tw',
-    ]
+    ])
 
     languages_by_size = [
         'en', 'ceb', 'de', 'fr', 'sv', 'nl', 'ru', 'es', 'it', 'arz', 'pl',
@@ -117,7 +117,7 @@ class Family(family.SubdomainFamily, family.WikimediaFamily):
     # Global bot allowed languages on
     # https://meta.wikimedia.org/wiki/BPI#Current_implementation
     # & https://meta.wikimedia.org/wiki/Special:WikiSets/2
-    cross_allowed = [
+    cross_allowed = family.LazyFrozenSet([
         'ab', 'ace', 'ady', 'af', 'als', 'am', 'an', 'ang', 'ar', 'arc', 'arz',
         'as', 'ast', 'atj', 'av', 'ay', 'az', 'ba', 'bar', 'bat-smg', 'bcl',
         'be', 'be-tarask', 'bg', 'bh', 'bi', 'bjn', 'bm', 'bo', 'bpy', 'bug',
@@ -143,7 +143,7 @@ class Family(family.SubdomainFamily, family.WikimediaFamily):
         'ug', 'uz', 've', 'vec', 'vep', 'vls', 'vo', 'wa', 'war', 'wo', 'xal',
         'xh', 'xmf', 'yi', 'yo', 'za', 'zea', 'zh', 'zh-classical',
         'zh-min-nan', 'zh-yue', 'zu',
-    ]
+    ])
 
     # Languages that used to be coded in iso-8859-1
     latin1old = {
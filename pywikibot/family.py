@@ -22,7 +22,13 @@ from typing import TYPE_CHECKING
 
 import pywikibot
 from pywikibot import config
-from pywikibot.backports import DefaultDict, Mapping, Sequence, removesuffix
+from pywikibot.backports import (
+    DefaultDict,
+    Iterable,
+    Mapping,
+    Sequence,
+    removesuffix,
+)
 from pywikibot.exceptions import FamilyMaintenanceWarning, UnknownFamilyError
 from pywikibot.tools import classproperty, deprecated, remove_last_args
 
@@ -39,6 +45,34 @@ NAME_CHARACTERS = string.ascii_letters + string.digits
 CODE_CHARACTERS = string.ascii_lowercase + string.digits + '_-'
 
 
+class LazyFrozenSet:
+
+    """Descriptor which creates a frozenset of codes on first access.
+
+    The frozenset replaces the descriptor in the owner class when it is
+    accessed the first time; the set is shared by all instances::
+
+        class Family(family.Family):
+            closed_wikis = family.LazyFrozenSet(['aa', 'ak'])
+
+    .. versionadded:: 9.0
+    """
+
+    def __init__(self, codes: Iterable[str]) -> None:
+        """Hold the codes."""
+        self.codes = codes
+
+    def __set_name__(self, owner, name: str) -> None:
+        """Hold the attribute name."""
+        self.name = name
+
+    def __get__(self, instance, owner) -> frozenset[str]:
+        """Create the frozenset and set it as owner class attribute."""
+        value = frozenset(self.codes)
+        setattr(owner, self.name, value)
+        return value
+
+
 class Family:
 
     """Parent singleton class for all wiki families.
@@ -95,10 +129,10 @@ class Family:
     name: str | None = None
 
     #: Not open for edits; stewards can still edit.
-    closed_wikis: list[str] = []
+    closed_wikis: list[str] | frozenset[str] = []
 
     #: Completely removed sites
-    removed_wikis: list[str] = []
+    removed_wikis: list[str] | frozenset[str] = []
 
     code_aliases: dict[str, str] = {}
     """Code mappings which are only an alias, and there is no 'old' wiki.
@@ -139,7 +173,7 @@ class Family:
     cross_projects_cookie_username = 'centralauth_User'
 
     # A list with the name in the cross-language flag permissions
-    cross_allowed: list[str] = []
+    cross_allowed: list[str] | frozenset[str] = []
 
     # A dict with the name of the category containing disambiguation
     # pages for the various languages. Only one category per language,
@@ -386,6 +420,7 @@ class Family:
             self._catredirtemplates[code] = []
             return
         cr_set = set()
+        known = frozenset(cr_template_tuple)
         site = pywikibot.Site(code, self)
         tpl_ns = site.namespaces.TEMPLATE
         for cr_template in cr_template_tuple:
@@ -395,7 +430,7 @@ class Family:
             for t in cr_page.backlinks(filter_redirects=True,
                                        namespaces=tpl_ns):
                 newtitle = t.title(with_ns=False)
-                if newtitle not in cr_template_tuple:
+                if newtitle not in known:
                     cr_set.add(newtitle)
         self._catredirtemplates[code] = list(cr_template_tuple) + list(cr_set)
 
@@ -739,7 +774,7 @@ class Family:
         .. versionchanged:: 8.2
            changed from list to invariant frozenset.
         """
-        return frozenset(cls.removed_wikis + cls.closed_wikis)
+        return frozenset(cls.removed_wikis).union(cls.closed_wikis)
 
 
 class SingleSiteFamily(Family):
@@ -784,7 +819,8 @@ class SubdomainFamily(Family):
         if hasattr(cls, 'test_codes'):
             codes += cls.test_codes
 
-        codes += cls.closed_wikis
+        # closed_wikis may be a set; keep the order deterministic
+        codes += sorted(cls.closed_wikis)
 
         # shortcut this classproperty
         cls.langs = {code: f'{code}.{cls.domain}' for code in codes}
@@ -8,7 +8,9 @@
 from __future__ import annotations
 
 import re
+from contextlib import suppress
 
+from pywikibot.backports import Iterable
 from pywikibot.userinterfaces import terminal_interface_base
 
 
@@ -32,6 +34,38 @@ unixColors = {
     'white': f'{chr(27)}[97m',
 }
 
+#: background colors derived from :data:`unixColors`
+unixBgColors = {
+    name: f'{chr(27)}[{int(code[2:-1]) + 10}m'
+    for name, code in unixColors.items()
+}
+
+_unix_bg_codes = {code: unixBgColors[name]
+                  for name, code in unixColors.items()}
+
+
+def colorize(text: str, spans: Iterable[tuple[int, int, str]]) -> str:
+    """Insert Unix color escape sequences into text.
+
+    >>> colorize('Hello world', [(6, 11, 'red')])
+    'Hello \\x1b[31mworld\\x1b[0m'
+
+    .. versionadded:: 9.0
+
+    :param text: text to be colorized
+    :param spans: ``(start, end, color)`` tuples in ascending order;
+        the spans must not overlap. Text outside of spans is left in
+        the default color.
+    """
+    reset = unixColors['default']
+    parts = []
+    pos = 0
+    for start, end, color in spans:
+        parts += [text[pos:start], unixColors[color], text[start:end], reset]
+        pos = end
+    parts.append(text[pos:])
+    return ''.join(parts)
+
 
 class UnixUI(terminal_interface_base.UI):
 
@@ -43,15 +77,26 @@ class UnixUI(terminal_interface_base.UI):
 
     @staticmethod
     def make_unix_bg_color(color):
-        """Obtain background color from foreground color."""
+        """Obtain background color from foreground color.
+
+        .. versionchanged:: 9.0
+           the background color of :data:`unixColors` values is taken
+           from a precomputed table.
+        """
+        with suppress(KeyError):
+            return _unix_bg_codes[color]
+
         code = re.search(r'(?<=\[)\d+', color).group()
-        return f'{chr(27)}[{str(int(code) + 10)}m'
+        return f'{chr(27)}[{int(code) + 10}m'
 
     def encounter_color(self, color, target_stream) -> None:
-        """Write the Unix color directly to the stream."""
+        """Write the Unix color directly to the stream.
+
+        .. versionchanged:: 9.0
+           foreground and background colors are written at once.
+        """
         fg, bg = self.divide_color(color)
-        fg = unixColors[fg]
-        self._write(fg, target_stream)
+        seq = unixColors[fg]
         if bg is not None:
-            bg = unixColors[bg]
-            self._write(self.make_unix_bg_color(bg), target_stream)
+            seq += unixBgColors[bg]
+        self._write(seq, target_stream)
@@ -53,6 +53,7 @@ extra_deps = {
     'mwoauth': ['mwoauth!=0.3.1,>=0.2.4'],
     'html': ['beautifulsoup4>=4.7.1'],
     'http': ['fake-useragent>1.2.1'],
+    'sparql': ['orjson>=3.6.0', 'ijson>=3.1'],
     'flake8': [  # Due to incompatibilities between packages the order matters.
         'flake8>=5.0.4',
         'darglint',
@@ -12,7 +12,7 @@ from contextlib import suppress
 
 import pywikibot
 from pywikibot.exceptions import UnknownFamilyError
-from pywikibot.family import Family, SingleSiteFamily
+from pywikibot.family import Family, LazyFrozenSet, SingleSiteFamily
 from pywikibot.tools import suppress_warnings
 from tests.aspects import PatchingTestCase, TestCase, unittest
 from tests.utils import DrySite
@@ -130,6 +130,27 @@ class TestFamily(TestCase):
         self.assertEqual(family.interwiki_replacements, {'a': 'b'})
         self.assertEqual(family.interwiki_removals, frozenset('c'))
 
+        # Construct a temporary family with frozenset attributes
+        family = type('TempFamily', (Family,),
+                      {'closed_wikis': frozenset('c'),
+                       'removed_wikis': LazyFrozenSet(['d'])})()
+        self.assertEqual(family.interwiki_removals, frozenset('cd'))
+
+    def test_lazy_frozenset(self):
+        """Test LazyFrozenSet descriptor."""
+        cls = type('TempFamily', (Family,),
+                   {'closed_wikis': LazyFrozenSet(['a', 'b', 'a'])})
+        self.assertIsInstance(cls.__dict__['closed_wikis'], LazyFrozenSet)
+        self.assertEqual(cls().closed_wikis, frozenset('ab'))
+        self.assertIs(cls.__dict__['closed_wikis'], cls.closed_wikis)
+
+    def test_wikipedia_closed_langs(self):
+        """Test that closed wikipedia codes are listed in sorted order."""
+        family = Family.load('wikipedia')
+        closed = [code for code in family.langs
+                  if code in family.closed_wikis]
+        self.assertEqual(closed, sorted(family.closed_wikis))
+
     def test_obsolete_readonly(self):
         """Test obsolete result not updatable."""
         family = Family.load('wikipedia')
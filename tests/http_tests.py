@@ -360,6 +360,28 @@ class CharsetTestCase(TestCase):
         resp.encoding = http._decide_encoding(resp)
         self.assertEqual('utf-8', resp.encoding)
 
+    def test_stream(self):
+        """Test that the content of streamed responses is not read."""
+        tests = [
+            ('text/html; charset=utf-8', None, 'utf-8'),
+            ('text/html; charset=utf-8', 'latin1', 'latin1'),
+            ('application/sparql-results+json', None, 'utf-8'),
+            ('application/xml', None, None),
+        ]
+        for content_type, charset, encoding in tests:
+            with self.subTest(content_type=content_type, charset=charset):
+                resp = CharsetTestCase._create_response(
+                    headers={'content-type': content_type})
+                resp._content = False
+                with patch.object(http.session, 'request',
+                                  return_value=resp):
+                    r = http.fetch('https://example.org/', stream=True,
+                                   charset=charset,
+                                   default_error_handling=False)
+                self.assertIs(r, resp)
+                self.assertFalse(r._content)
+                self.assertEqual(r.encoding, encoding)
+
     def test_content_type_xml(self):
         """Test xml content with encoding given in content."""
         tests = [
@@ -10,12 +10,13 @@ from __future__ import annotations
 import json
 import unittest
 from contextlib import suppress
+from io import BytesIO
 from unittest.mock import patch
 
 import pywikibot
 import pywikibot.data.sparql as sparql
 from pywikibot.exceptions import NoUsernameError
-from tests.aspects import TestCase, WikidataTestCase
+from tests.aspects import TestCase, WikidataTestCase, require_modules
 from tests.utils import skipping
 
 
@@ -93,12 +94,28 @@ class Container:
     def __init__(self, value):
         """Create container."""
         self.text = value
+        self.content = value.encode()
 
     def json(self):
         """Simulate Response.json()."""  # noqa: D402
         return json.loads(self.text)
 
 
+class StreamContainer(Container):
+    """Simple test container for streamed responses."""
+
+    def __init__(self, value, headers=None):
+        """Create container."""
+        super().__init__(value)
+        self.headers = headers or {}
+        self.raw = BytesIO(self.content)
+        self.closed = False
+
+    def close(self):
+        """Simulate Response.close()."""
+        self.closed = True
+
+
 class TestSparql(WikidataTestCase):
     """Test SPARQL queries."""
 
@@ -184,6 +201,336 @@ class TestSparql(WikidataTestCase):
         self.assertFalse(res)
 
 
+class TestSparqlSession(TestCase):
+    """Test connection pooling of SPARQL endpoints."""
+
+    net = False
+
+    def test_mount_adapter(self):
+        """Test that a pool adapter is mounted once per endpoint host."""
+        endpoint = 'https://sparql.example.org/sparql'
+        prefix = 'https://sparql.example.org/'
+        with patch.dict(sparql.http.session.adapters):
+            sparql.SparqlQuery(endpoint=endpoint, entity_url='foo')
+            adapter = sparql.http.session.adapters[prefix]
+            sparql.SparqlQuery(endpoint=endpoint + '2', entity_url='foo')
+            self.assertIs(sparql.http.session.adapters[prefix], adapter)
+
+    @patch.object(sparql.http, 'fetch')
+    def test_post_query(self, mock_method):
+        """Test that the query is sent as form-encoded POST body."""
+        mock_method.return_value = Container(RESPONSE_TRUE)
+        endpoint = 'https://sparql.example.org/sparql'
+        q = sparql.SparqlQuery(endpoint=endpoint, entity_url='foo')
+        self.assertTrue(q.ask('ASK { ?x ?y ?z }'))
+        args, kwargs = mock_method.call_args
+        self.assertEqual(args, (endpoint, ))
+        self.assertEqual(kwargs['method'], 'POST')
+        self.assertEqual(kwargs['data'], {'query': 'ASK { ?x ?y ?z }'})
+        self.assertEqual(kwargs['headers']['Content-Type'],
+                         'application/x-www-form-urlencoded')
+        self.assertNotIn('Content-Type', sparql.DEFAULT_HEADERS)
+
+
+class TestSparqlRepo(TestCase):
+    """Test SPARQL endpoint lookup of repositories."""
+
+    net = False
+
+    class Repo:
+        """Fake repository."""
+
+        concept_base_uri = 'http://www.wikidata.org/entity/'
+
+        def __init__(self, endpoint):
+            """Create fake repository."""
+            self.endpoint = endpoint
+            self.calls = 0
+
+        @property
+        def sparql_endpoint(self):
+            """Return the endpoint and count the calls."""
+            self.calls += 1
+            return self.endpoint
+
+    def test_repo_endpoint(self):
+        """Test that the repository endpoint is looked up once."""
+        repo = self.Repo('https://sparql.example.org/sparql')
+        for _ in range(2):
+            q = sparql.SparqlQuery(repo=repo)
+            self.assertEqual(q.endpoint, repo.endpoint)
+            self.assertEqual(q.entity_url, repo.concept_base_uri)
+        self.assertEqual(repo.calls, 1)
+        self.assertEqual(q.max_retries, pywikibot.config.max_retries)
+        self.assertEqual(q.retry_wait, pywikibot.config.retry_wait)
+
+        repo = self.Repo(None)
+        with self.assertRaisesRegex(pywikibot.exceptions.Error,
+                                    'does not provide a sparql endpoint'):
+            sparql.SparqlQuery(repo=repo)
+
+
+class TestSparqlSelect(TestCase):
+    """Test processing of SELECT query results."""
+
+    net = False
+
+    @patch.object(sparql.http, 'fetch')
+    def test_select_bindings(self, mock_method):
+        """Test missing variables and unknown types."""
+        q = sparql.SparqlQuery(endpoint='https://sparql.example.org/sparql',
+                               entity_url='http://www.wikidata.org/entity/')
+        mock_method.return_value = Container(
+            SQL_RESPONSE_CONTAINER % '{"cat": {"type": "bnode", "value": 1}}')
+        for full_data in (False, True):
+            with self.subTest(full_data=full_data):
+                res = q.select('SELECT * WHERE { ?x ?y ?z }',
+                               full_data=full_data)
+                self.assertEqual(list(res[0]), ['cat', 'd', 'catLabel'])
+                self.assertIsNone(res[0]['d'])
+                self.assertIsNone(res[0]['catLabel'])
+
+        mock_method.return_value = Container(
+            SQL_RESPONSE_CONTAINER % '{"cat": {"type": "foo", "value": 1}}')
+        with self.assertRaisesRegex(ValueError, 'Unknown type: foo'):
+            q.select('SELECT * WHERE { ?x ?y ?z }', full_data=True)
+
+        mock_method.return_value = Container(
+            SQL_RESPONSE_CONTAINER % '{"cat": {"value": 1}}')
+        with self.assertRaisesRegex(KeyError, 'type'):
+            q.select('SELECT * WHERE { ?x ?y ?z }', full_data=True)
+
+        mock_method.return_value = Container(
+            SQL_RESPONSE_CONTAINER.replace('"cat", "d", "catLabel"', '')
+            % ITEM_Q498787)
+        self.assertEqual(q.select('SELECT * WHERE { ?x ?y ?z }'), [{}])
+
+    @patch.object(sparql.http, 'fetch')
+    def test_ask(self, mock_method):
+        """Test ASK query with small and large responses."""
+        q = sparql.SparqlQuery(endpoint='https://sparql.example.org/sparql',
+                               entity_url='foo')
+        for response, expected in ((RESPONSE_TRUE, True),
+                                   (RESPONSE_FALSE, False)):
+            for padding in (0, 256):
+                mock_method.return_value = Container(response + ' ' * padding)
+                with self.subTest(expected=expected, padding=padding), \
+                     patch.object(q, '_decode', wraps=q._decode) as decode:
+                    self.assertIs(q.ask('ASK { ?x ?y ?z }'), expected)
+                    self.assertEqual(decode.called, bool(padding))
+
+    @patch.object(sparql.http, 'fetch')
+    def test_get_items(self, mock_method):
+        """Test get_items with and without full data."""
+        mock_method.return_value = Container(
+            SQL_RESPONSE_CONTAINER % '{}, {}'.format(
+                ITEM_Q498787,
+                '{"cat": {"type": "uri", "value": "http://example.org/Q1"}}'))
+        q = sparql.SparqlQuery(endpoint='https://sparql.example.org/sparql',
+                               entity_url='http://www.wikidata.org/entity/')
+        for full_data in (False, True):
+            with self.subTest(full_data=full_data):
+                self.assertEqual(
+                    q.get_items('SELECT * WHERE { ?x ?y ?z }', 'cat',
+                                result_type=list, full_data=full_data),
+                    ['Q498787', None])
+
+    @patch.object(sparql.http, 'fetch')
+    def test_login_page(self, mock_method):
+        """Test HTML login page returned instead of a result."""
+        page = '<!DOCTYPE html><html>Special:UserLogin</html>'
+        mock_method.return_value = Container(page)
+        q = sparql.SparqlQuery(endpoint='https://sparql.example.org/sparql',
+                               entity_url='foo')
+        self.assertIsNone(q.select('SELECT * WHERE { ?x ?y ?z }'))
+
+        q = sparql.SparqlQuery(
+            endpoint='https://commons-query.wikimedia.org/sparql',
+            entity_url='foo')
+        with self.assertRaisesRegex(NoUsernameError, 'User not logged in'):
+            q.select('SELECT * WHERE { ?x ?y ?z }')
+
+        mock_method.return_value = Container(page[15:])  # no DOCTYPE
+        self.assertIsNone(q.select('SELECT * WHERE { ?x ?y ?z }'))
+
+
+@require_modules('ijson')
+class TestSparqlStream(TestCase):
+    """Test incremental parsing of SELECT query results."""
+
+    net = False
+
+    def setUp(self):
+        """Create query object."""
+        super().setUp()
+        self.query = sparql.SparqlQuery(
+            endpoint='https://sparql.example.org/sparql',
+            entity_url='http://www.wikidata.org/entity/')
+
+    @patch.object(sparql.http, 'fetch')
+    def test_select_stream(self, mock_method):
+        """Test streamed SELECT query."""
+        text = SQL_RESPONSE_CONTAINER % '{}, {}'.format(ITEM_Q498787,
+                                                        ITEM_Q677525)
+        mock_method.return_value = Container(text)
+        expected = self.query.select('SELECT * WHERE { ?x ?y ?z }')
+
+        # the fake raw stream is not compressed but content-encoding
+        # tells that the content-length is not the real size
+        for headers in ({}, {'content-length': '100'},
+                        {'content-length': '100', 'content-encoding': 'gzip'}):
+            with self.subTest(headers=headers):
+                response = StreamContainer(text, headers=headers)
+                mock_method.return_value = response
+                res = self.query.select('SELECT * WHERE { ?x ?y ?z }',
+                                        stream=True)
+                self.assertTrue(mock_method.call_args[1]['stream'])
+                self.assertEqual(res, expected)
+                # small responses are not parsed incrementally
+                streamed = ('content-length' not in headers
+                            or 'content-encoding' in headers)
+                self.assertEqual(response.closed, streamed)
+                self.assertEqual(bool(response.raw.tell()), streamed)
+
+                mock_method.return_value = StreamContainer(text, headers)
+                res = self.query.select('SELECT * WHERE { ?x ?y ?z }',
+                                        full_data=True, stream=True)
+                self.assertLength(res, 2)
+                self.assertEqual(res[1]['cat'].getID(), 'Q677525')
+                self.assertEqual(repr(res[0]['catLabel']), 'Muezza@en')
+
+    @patch.object(sparql.http, 'fetch')
+    def test_login_page_stream(self, mock_method):
+        """Test streamed HTML login page instead of a result."""
+        page = '<!DOCTYPE html><html>Special:UserLogin</html>'
+        headers = {'content-length': str(self.query.stream_min_size)}
+        for headers in ({}, headers):
+            with self.subTest(headers=headers):
+                response = StreamContainer(page, headers)
+                mock_method.return_value = response
+                self.assertIsNone(self.query.select(
+                    'SELECT * WHERE { ?x ?y ?z }', stream=True))
+                self.assertTrue(response.closed)
+
+                q = sparql.SparqlQuery(
+                    endpoint='https://commons-query.wikimedia.org/sparql',
+                    entity_url='foo')
+                mock_method.return_value = StreamContainer(page, headers)
+                with self.assertRaisesRegex(NoUsernameError,
+                                            'User not logged in'):
+                    q.select('SELECT * WHERE { ?x ?y ?z }', stream=True)
+
+    @patch.object(sparql.http, 'fetch')
+    def test_stream_not_cached(self, mock_method):
+        """Test that streamed results are not cached."""
+        text = SQL_RESPONSE_CONTAINER % ITEM_Q498787
+        self.query.cache_ttl = None
+        for _ in range(2):
+            mock_method.return_value = StreamContainer(text)
+            self.query.select('SELECT * WHERE { ?x ?y ?z }', stream=True)
+        self.assertEqual(mock_method.call_count, 2)
+        self.assertIsEmpty(sparql.SparqlQuery._cache)
+
+    @patch.object(sparql.http, 'fetch')
+    def test_ask_stream(self, mock_method):
+        """Test streamed query without results."""
+        mock_method.return_value = StreamContainer(RESPONSE_TRUE)
+        self.assertIsNone(self.query.select('ASK { ?x ?y ?z }', stream=True))
+
+
+class TestSparqlCache(TestCase):
+    """Test caching of SPARQL query results."""
+
+    net = False
+
+    def setUp(self):
+        """Clear query cache."""
+        super().setUp()
+        sparql.SparqlQuery.clear_cache()
+        self.query = sparql.SparqlQuery(
+            endpoint='https://sparql.example.org/sparql',
+            entity_url='http://www.wikidata.org/entity/', cache_ttl=None)
+
+    @patch.object(sparql.http, 'fetch')
+    def test_select_cached(self, mock_method):
+        """Test that repeated queries are fetched only once."""
+        mock_method.return_value = Container(
+            SQL_RESPONSE_CONTAINER % ITEM_Q498787)
+        res = self.query.select('SELECT * WHERE { ?x ?y ?z }')
+        res[0]['cat'] = None
+        self.assertEqual(self.query.select('SELECT * WHERE { ?x ?y ?z }'),
+                         [{'cat': 'http://www.wikidata.org/entity/Q498787',
+                           'catLabel': 'Muezza',
+                           'd': '1955-01-01T00:00:00Z'}])
+        self.assertEqual(mock_method.call_count, 1)
+        self.assertLength(sparql.SparqlQuery._cache, 1)
+
+    @patch.object(sparql.http, 'fetch')
+    def test_select_cached_nodes(self, mock_method):
+        """Test that cached nodes are neither shared nor modified."""
+        mock_method.return_value = Container(
+            SQL_RESPONSE_CONTAINER % ITEM_Q498787)
+        query = 'SELECT * WHERE { ?x ?y ?z }'
+        res1 = self.query.select(query, full_data=True)
+        res2 = self.query.select(query, full_data=True)
+        self.assertIsNot(res1[0]['cat'], res2[0]['cat'])
+        res1[0]['cat'].value = None
+        self.assertEqual(self.query.get_items(query, 'cat', full_data=True),
+                         {'Q498787'})
+
+        other = sparql.SparqlQuery(endpoint=self.query.endpoint,
+                                   entity_url='http://b.org/entity/',
+                                   cache_ttl=None)
+        self.assertEqual(other.get_items(query, 'cat', full_data=True),
+                         {None})
+        self.assertEqual(mock_method.call_count, 2)
+
+    @patch.object(sparql.http, 'fetch')
+    def test_query_cached(self, mock_method):
+        """Test that cached query results cannot be modified."""
+        mock_method.return_value = Container(
+            SQL_RESPONSE_CONTAINER % ITEM_Q498787)
+        data = self.query.query('SELECT * WHERE { ?x ?y ?z }')
+        data['results']['bindings'].clear()
+        data = self.query.query('SELECT * WHERE { ?x ?y ?z }')
+        self.assertLength(data['results']['bindings'], 1)
+        self.assertEqual(mock_method.call_count, 1)
+
+    @patch.object(sparql.http, 'fetch')
+    def test_not_cached_by_default(self, mock_method):
+        """Test that results are not cached without cache_ttl."""
+        mock_method.return_value = Container(RESPONSE_TRUE)
+        query = sparql.SparqlQuery(
+            endpoint='https://sparql.example.org/sparql', entity_url='foo')
+        for _ in range(2):
+            query.ask('ASK { ?x ?y ?z }')
+        self.assertEqual(mock_method.call_count, 2)
+        self.assertIsEmpty(sparql.SparqlQuery._cache)
+
+    @patch.object(sparql.http, 'fetch')
+    def test_not_cacheable(self, mock_method):
+        """Test that non-deterministic queries are not cached."""
+        mock_method.return_value = Container(RESPONSE_TRUE)
+        for _ in range(2):
+            self.query.ask('ASK { FILTER(RAND() < 0.5) }')
+        self.assertEqual(mock_method.call_count, 2)
+
+    @patch.object(sparql.http, 'fetch')
+    def test_cache_ttl(self, mock_method):
+        """Test that expired or disabled cache entries are refetched."""
+        mock_method.return_value = Container(RESPONSE_TRUE)
+        self.query.cache_ttl = 60
+        self.query.ask('ASK { ?x ?y ?z }')
+        with patch.object(sparql.time, 'monotonic',
+                          return_value=sparql.time.monotonic() + 61):
+            self.query.ask('ASK { ?x ?y ?z }')
+        self.assertEqual(mock_method.call_count, 2)
+
+        self.query.cache_ttl = 0
+        self.query.ask('ASK { ?x ?y ?z }')
+        self.assertEqual(mock_method.call_count, 3)
+
+
 class TestCommonsQueryService(TestCase):
     """Test Commons Query Service auth."""
 
@@ -232,6 +579,10 @@ class Shared:
             """__str__ should return type str."""
             self.assertIsInstance(self.object_under_test.__str__(), str)
 
+        def test_slots(self):
+            """Object should not have an instance dict."""
+            self.assertFalse(hasattr(self.object_under_test, '__dict__'))
+
 
 class LiteralTests(Shared.SparqlNodeTests):
     """Tests for sparql.Literal."""
@@ -255,6 +606,16 @@ class URITests(Shared.SparqlNodeTests):
     object_under_test = sparql.URI(
         {'value': 'http://foo.com'}, 'http://bar.com')
 
+    def test_getID(self):  # noqa: N802
+        """Test getID method."""
+        self.assertIsNone(self.object_under_test.getID())
+        uri = sparql.URI({'value': 'http://bar.com/Q1'}, 'http://bar.com/')
+        self.assertEqual(uri.getID(), 'Q1')
+        uri = sparql.URI({'value': 'http://bär.com/Q1'}, 'http://bär.com/')
+        self.assertEqual(uri.getID(), 'Q1')
+        uri = sparql.URI({'value': 'http://bär.com/Q1'}, 'http://bar.com/')
+        self.assertIsNone(uri.getID())
+
 
 if __name__ == '__main__':  # pragma: no cover
     with suppress(SystemExit):
@@ -40,6 +40,12 @@ loggingcontext = {'caller_name': 'ui_tests',
                   'caller_line': 0,
                   'newline': '\n'}
 
+# expected output of transliterated text: each replaced character is
+# highlighted by the terminal interface
+TRANSLITERATED = 'abcd {} {} {}\n'.format(
+    *(''.join(f'\x1b[93m{char}\x1b[0m' for char in chars)
+      for chars in ('ABGD', 'abgd', 'aiueo')))
+
 
 class UITestCase(TestCaseBase):
 
@@ -47,43 +53,69 @@ class UITestCase(TestCaseBase):
 
     net = False
 
-    def setUp(self):
-        """Setup test.
+    colorized_output = True
+    transliterate = False
+    encoding = 'utf-8'
+
+    @classmethod
+    def setUpClass(cls):
+        """Setup test class.
 
-        Here we patch standard input, output, and errors, essentially
-        redirecting to `StringIO` streams.
+        Create `StringIO` streams for standard input, output, and
+        errors and set the terminal interface and the config options
+        given by the class attributes once for all tests.
         """
-        super().setUp()
-        self.stdout_patcher = patch('sys.stdout', new_callable=io.StringIO)
-        self.strout = self.stdout_patcher.start()
-        self.stderr_patcher = patch('sys.stderr', new_callable=io.StringIO)
-        self.strerr = self.stderr_patcher.start()
-        self.stdin_patcher = patch('sys.stdin', new_callable=io.StringIO)
-        self.strin = self.stdin_patcher.start()
+        super().setUpClass()
+        cls.strout = io.StringIO()
+        cls.strerr = io.StringIO()
+        cls.strin = io.StringIO()
+
+        cls.org_config = (pywikibot.config.colorized_output,
+                          pywikibot.config.transliterate)
+        pywikibot.config.colorized_output = cls.colorized_output
+        pywikibot.config.transliterate = cls.transliterate
 
         pywikibot.bot.set_interface('terminal')
+        pywikibot.bot.ui.transliteration_target = None
+        pywikibot.bot.ui.encoding = cls.encoding
 
-        self.org_input = pywikibot.bot.ui._raw_input
-        pywikibot.bot.ui._raw_input = self._patched_input
+        cls.org_input = pywikibot.bot.ui._raw_input
+        pywikibot.bot.ui._raw_input = cls._patched_input
 
-        pywikibot.config.colorized_output = True
-        pywikibot.config.transliterate = False
-        pywikibot.ui.transliteration_target = None
-        pywikibot.ui.encoding = 'utf-8'
+    @classmethod
+    def tearDownClass(cls):
+        """Cleanup test class."""
+        pywikibot.bot.ui._raw_input = cls.org_input
+        pywikibot.bot.set_interface('buffer')
+        (pywikibot.config.colorized_output,
+         pywikibot.config.transliterate) = cls.org_config
+        super().tearDownClass()
 
-    def tearDown(self):
-        """Cleanup test."""
-        super().tearDown()
+    def setUp(self):
+        """Setup test.
 
-        self.stdout_patcher.stop()
-        self.stderr_patcher.stop()
-        self.stdin_patcher.stop()
+        Here we reset and patch standard input, output, and errors,
+        essentially redirecting to `StringIO` streams. The streams have
+        to be patched for each test because test runners like pytest
+        replace them between tests.
+        """
+        super().setUp()
+        self._reset_streams()
 
-        pywikibot.bot.ui._raw_input = self.org_input
-        pywikibot.bot.set_interface('buffer')
+        patcher = patch.multiple('sys', stdout=self.strout,
+                                 stderr=self.strerr, stdin=self.strin)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _reset_streams(self):
+        """Rewind and empty the patched terminal streams."""
+        for stream in (self.strout, self.strerr, self.strin):
+            stream.seek(0)
+            stream.truncate()
 
-    def _patched_input(self):
-        return self.strin.readline().strip()
+    @classmethod
+    def _patched_input(cls):
+        return cls.strin.readline().strip()
 
 
 class ExceptionTestError(Exception):
@@ -113,11 +145,7 @@ class TestTerminalOutput(UITestCase):
                 logger.log(level, text, extra=loggingcontext)
                 self.assertEqual(self.strout.getvalue(), out)
                 self.assertEqual(self.strerr.getvalue(), err)
-
-                # reset terminal files
-                for stream in [self.strout, self.strerr, self.strin]:
-                    stream.truncate(0)
-                    stream.seek(0)
+                self._reset_streams()
 
     def test_output(self):
         pywikibot.info('output')
@@ -229,36 +257,24 @@ class TestTerminalInput(UITestCase):
         self.assertIsInstance(rv, str)
         return rv
 
-    def testInputChoiceDefault(self):
-        self.strin.write('\n')
-        self.strin.seek(0)
-        returned = self._call_input_choice()
-
-        self.assertEqual(returned, 'a')
-
-    def testInputChoiceCapital(self):
-        self.strin.write('N\n')
-        self.strin.seek(0)
-        returned = self._call_input_choice()
-
-        self.assertEqual(self.strerr.getvalue(), self.input_choice_output)
-        self.assertEqual(returned, 'n')
-
-    def testInputChoiceNonCapital(self):
-        self.strin.write('n\n')
-        self.strin.seek(0)
-        returned = self._call_input_choice()
-
-        self.assertEqual(self.strerr.getvalue(), self.input_choice_output)
-        self.assertEqual(returned, 'n')
-
-    def testInputChoiceIncorrectAnswer(self):
-        self.strin.write('X\nN\n')
-        self.strin.seek(0)
-        returned = self._call_input_choice()
-
-        self.assertEqual(self.strerr.getvalue(), self.input_choice_output * 2)
-        self.assertEqual(returned, 'n')
+    def test_input_choice(self):
+        """Test input_choice function with different answers."""
+        tests = [
+            ('default', '\n', 'a', 1),
+            ('capital', 'N\n', 'n', 1),
+            ('non capital', 'n\n', 'n', 1),
+            ('incorrect answer', 'X\nN\n', 'n', 2),
+        ]
+        for test, answer, expected, prompts in tests:
+            with self.subTest(test=test):
+                self._reset_streams()
+                self.strin.write(answer)
+                self.strin.seek(0)
+                returned = self._call_input_choice()
+
+                self.assertEqual(self.strerr.getvalue(),
+                                 self.input_choice_output * prompts)
+                self.assertEqual(returned, expected)
 
     def test_input_list_choice(self):
         """Test input_list_choice function."""
@@ -288,13 +304,13 @@ class TestTerminalOutputColorUnix(UITestCase):
             self.strerr.getvalue(),
             'text \x1b[95mlight purple text\x1b[0m text\n')
 
-    def testOutputNoncolorizedText(self):
-        pywikibot.config.colorized_output = False
-        pywikibot.info(self.str1)
+    def test_output_background_color(self):
+        """Test foreground and background color written at once."""
+        pywikibot.info('text <<lightpurple;white>>on white<<default>> text')
         self.assertEqual(self.strout.getvalue(), '')
         self.assertEqual(
             self.strerr.getvalue(),
-            'text light purple text text ***\n')
+            'text \x1b[95m\x1b[107mon white\x1b[0m text\n')
 
     str2 = ('normal text <<lightpurple>> light purple '
             '<<lightblue>> light blue <<previous>> light purple '
@@ -311,6 +327,21 @@ class TestTerminalOutputColorUnix(UITestCase):
             '\x1b[0m normal text\n')
 
 
+@unittest.skipUnless(os.name == 'posix', 'requires Unix console')
+class TestTerminalOutputNoColorUnix(UITestCase):
+
+    """Terminal output tests with colorized output disabled."""
+
+    colorized_output = False
+
+    def testOutputNoncolorizedText(self):
+        pywikibot.info(TestTerminalOutputColorUnix.str1)
+        self.assertEqual(self.strout.getvalue(), '')
+        self.assertEqual(
+            self.strerr.getvalue(),
+            'text light purple text text ***\n')
+
+
 @unittest.skipUnless(os.name == 'posix', 'requires Unix console')
 class TestTerminalUnicodeUnix(UITestCase):
 
@@ -340,17 +371,13 @@ class TestTransliterationUnix(UITestCase):
 
     """Terminal output transliteration tests."""
 
+    transliterate = True
+    encoding = 'latin-1'
+
     def testOutputTransliteratedUnicodeText(self):
-        pywikibot.bot.ui.encoding = 'latin-1'
-        pywikibot.config.transliterate = True
         pywikibot.info('abcd АБГД αβγδ あいうえお')
         self.assertEqual(self.strout.getvalue(), '')
-        self.assertEqual(
-            self.strerr.getvalue(),
-            'abcd \x1b[93mA\x1b[0m\x1b[93mB\x1b[0m\x1b[93mG\x1b[0m'
-            '\x1b[93mD\x1b[0m \x1b[93ma\x1b[0m\x1b[93mb\x1b[0m\x1b[93mg'
-            '\x1b[0m\x1b[93md\x1b[0m \x1b[93ma\x1b[0m\x1b[93mi\x1b[0m'
-            '\x1b[93mu\x1b[0m\x1b[93me\x1b[0m\x1b[93mo\x1b[0m\n')
+        self.assertEqual(self.strerr.getvalue(), TRANSLITERATED)
 
 
 class TestTransliterationTable(TestCase):
@@ -495,6 +522,32 @@ class FakeUnixTest(FakeUIColorizedTestBase, FakeUITest):
     ui_class = terminal_interface_unix.UnixUI
 
 
+class TestUnixColors(TestCase):
+
+    """Test Unix color escape code helpers."""
+
+    net = False
+
+    def test_make_unix_bg_color(self):
+        """Test background color of foreground escape codes."""
+        make_bg = terminal_interface_unix.UnixUI.make_unix_bg_color
+        for code, expected in (('\x1b[31m', '\x1b[41m'),
+                               ('\x1b[97m', '\x1b[107m'),
+                               ('\x1b[38m', '\x1b[48m'),
+                               ('\x1b[33;1m', '\x1b[43m')):
+            with self.subTest(code=code):
+                self.assertEqual(make_bg(code), expected)
+
+    def test_colorize(self):
+        """Test inserting colors for spans of a text."""
+        text = 'normal red blue normal'
+        spans = [(7, 10, 'red'), (11, 15, 'lightblue')]
+        self.assertEqual(
+            terminal_interface_unix.colorize(text, spans),
+            'normal \x1b[31mred\x1b[0m \x1b[94mblue\x1b[0m normal')
+        self.assertEqual(terminal_interface_unix.colorize(text, []), text)
+
+
 class FakeWin32Test(FakeUIColorizedTestBase, FakeUITest):
 
     """